@@ -0,0 +1,215 @@
+import argparse
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+DB_PATH = "tyforge.db"
+ARCHIVE_DB_PATH = "tyforge_archive.db"
+BACKUP_DIR = "backups"
+BACKUP_KEEP = 7
+# Copy a few pages per step and pause in between so live writers are not starved
+BACKUP_PAGES_PER_STEP = 64
+BACKUP_STEP_SLEEP_SECONDS = 0.01
+
+# Columns that point at files under uploads/, with the archive database attached as "archive"
+UPLOAD_REFERENCES = [
+    ("main.synopsis", "file_name"),
+    ("main.user_projects", "synopsis_file_path"),
+    ("main.projects", "file_path"),
+    ("archive.synopsis", "file_name"),
+]
+
+def source_version(db_path: str):
+    # The header change counter (offset 24) only moves on commit in rollback-journal mode;
+    # WAL databases (write version 2 at offset 18) always get a fresh snapshot.
+    with open(db_path, "rb") as f:
+        header = f.read(28)
+    if len(header) < 28 or header[18] == 2:
+        return None
+    return int.from_bytes(header[24:28], "big")
+
+def backup_database(src_path: str, dest_path: str, pages_per_step: int = BACKUP_PAGES_PER_STEP, step_sleep: float = BACKUP_STEP_SLEEP_SECONDS):
+    progress_state = {"pages": 0}
+
+    def progress(status, remaining, total):
+        progress_state["pages"] = total
+        if remaining:
+            time.sleep(step_sleep)
+
+    src = sqlite3.connect(src_path, timeout=10)
+    dst = sqlite3.connect(dest_path)
+    started = time.monotonic()
+    try:
+        src.backup(dst, pages=pages_per_step, progress=progress)
+    finally:
+        dst.close()
+        src.close()
+    return progress_state["pages"], time.monotonic() - started
+
+def check_integrity(db_path: str):
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute("PRAGMA integrity_check").fetchall()
+    finally:
+        conn.close()
+    return "ok" if rows == [("ok",)] else "; ".join(row[0] for row in rows)
+
+def copy_database(src_path: str, snapshot_path: str, pages_per_step: int, step_sleep: float):
+    partial_path = snapshot_path + ".part"
+    try:
+        pages, duration = backup_database(src_path, partial_path, pages_per_step, step_sleep)
+    except Exception:
+        # list_snapshots never sees .part files, so rotation would not clean this up
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    integrity = check_integrity(partial_path)
+    if integrity != "ok":
+        os.remove(partial_path)
+        raise RuntimeError(f"Integrity check failed for {os.path.basename(snapshot_path)}: {integrity}")
+    os.replace(partial_path, snapshot_path)
+    return {
+        "snapshot": os.path.basename(snapshot_path),
+        "source": src_path,
+        "size_bytes": os.path.getsize(snapshot_path),
+        "pages": pages,
+        "duration_seconds": round(duration, 3),
+        "pages_per_second": round(pages / duration, 1) if duration else None,
+        "integrity": integrity,
+    }
+
+def upload_manifest(db_path: str, archive_path: str = None):
+    # Read from the snapshots, not the live databases, so the manifest matches the copy
+    union = " UNION ".join(
+        f"SELECT {column} AS path FROM {table} WHERE {column} IS NOT NULL"
+        for table, column in UPLOAD_REFERENCES
+        if archive_path or not table.startswith("archive.")
+    )
+    files = []
+    conn = sqlite3.connect(db_path)
+    try:
+        if archive_path:
+            conn.execute("ATTACH DATABASE ? AS archive", (archive_path,))
+        for (path,) in conn.execute(f"SELECT path FROM ({union}) ORDER BY path"):
+            try:
+                stat = os.stat(path)
+                files.append({"path": path, "exists": True, "size": stat.st_size,
+                              "modified_at": datetime.fromtimestamp(stat.st_mtime).isoformat()})
+            except FileNotFoundError:
+                files.append({"path": path, "exists": False})
+    finally:
+        conn.close()
+    return files
+
+def list_snapshots(backup_dir: str):
+    return sorted(
+        name for name in os.listdir(backup_dir)
+        if name.startswith("tyforge-") and name.endswith(".db")
+    )
+
+def rotate_snapshots(backup_dir: str, keep: int):
+    removed = []
+    snapshots = list_snapshots(backup_dir)
+    for name in snapshots[:max(len(snapshots) - keep, 0)]:
+        for path in (name, name[:-3] + ".json", archive_snapshot_name(name)):
+            if os.path.exists(os.path.join(backup_dir, path)):
+                os.remove(os.path.join(backup_dir, path))
+        removed.append(name)
+    return removed
+
+def archive_snapshot_name(name: str):
+    return name.replace("tyforge-", "tyforge_archive-", 1)
+
+def latest_manifest(backup_dir: str):
+    snapshots = list_snapshots(backup_dir)
+    if not snapshots:
+        return None
+    manifest_path = os.path.join(backup_dir, snapshots[-1][:-3] + ".json")
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as f:
+        return json.load(f)
+
+def create_snapshot(
+    db_path: str = DB_PATH,
+    archive_path: str = ARCHIVE_DB_PATH,
+    backup_dir: str = BACKUP_DIR,
+    keep: int = BACKUP_KEEP,
+    pages_per_step: int = BACKUP_PAGES_PER_STEP,
+    step_sleep: float = BACKUP_STEP_SLEEP_SECONDS,
+    with_uploads: bool = False,
+    force: bool = False,
+):
+    os.makedirs(backup_dir, exist_ok=True)
+    has_archive = bool(archive_path) and os.path.exists(archive_path)
+
+    # Skip the copy entirely when nothing was committed to either database since the last snapshot
+    version = source_version(db_path)
+    archive_version = source_version(archive_path) if has_archive else None
+    latest = latest_manifest(backup_dir)
+    if (not force and version is not None and latest and latest.get("source_version") == version
+            and (not has_archive or (archive_version is not None and latest.get("archive_source_version") == archive_version))):
+        return {"skipped": True, "reason": "unchanged since last snapshot", "snapshot": latest["snapshot"]}
+
+    name = f"tyforge-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.db"
+    snapshot_path = os.path.join(backup_dir, name)
+    archive_snapshot_path = os.path.join(backup_dir, archive_snapshot_name(name))
+
+    manifest = copy_database(db_path, snapshot_path, pages_per_step, step_sleep)
+    manifest["created_at"] = datetime.now().isoformat()
+    manifest["source_version"] = version
+    manifest["archive"] = None
+    if has_archive:
+        try:
+            manifest["archive"] = copy_database(archive_path, archive_snapshot_path, pages_per_step, step_sleep)
+        except (RuntimeError, sqlite3.Error):
+            os.remove(snapshot_path)
+            raise
+        manifest["archive_source_version"] = archive_version
+    if with_uploads:
+        manifest["uploads"] = upload_manifest(snapshot_path, archive_snapshot_path if has_archive else None)
+    with open(snapshot_path[:-3] + ".json", "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    report = {key: value for key, value in manifest.items() if key != "uploads"}
+    if with_uploads:
+        report["uploads"] = len(manifest["uploads"])
+        report["uploads_missing"] = sum(1 for entry in manifest["uploads"] if not entry["exists"])
+    report["rotated"] = rotate_snapshots(backup_dir, keep)
+    return report
+
+def print_report(report: dict):
+    if report.get("skipped"):
+        print(f"Skipped: {report['reason']} ({report['snapshot']})")
+        return
+    print(f"Snapshot {report['snapshot']}: {report['pages']} pages in {report['duration_seconds']}s "
+          f"({report['pages_per_second']} pages/s), integrity {report['integrity']}")
+    archive = report["archive"]
+    if archive:
+        print(f"Archive {archive['snapshot']}: {archive['pages']} pages in {archive['duration_seconds']}s "
+              f"({archive['pages_per_second']} pages/s), integrity {archive['integrity']}")
+    if "uploads" in report:
+        print(f"Uploads manifest: {report['uploads']} files, {report['uploads_missing']} missing")
+    for name in report["rotated"]:
+        print(f"Rotated out {name}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Online backup of tyforge.db and its archive using SQLite's backup API")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--archive", default=ARCHIVE_DB_PATH, help="archive database to snapshot alongside --db")
+    parser.add_argument("--dest", default=BACKUP_DIR)
+    parser.add_argument("--keep", type=int, default=BACKUP_KEEP, help="number of snapshots to keep")
+    parser.add_argument("--pages", type=int, default=BACKUP_PAGES_PER_STEP, help="pages copied per step")
+    parser.add_argument("--sleep", type=float, default=BACKUP_STEP_SLEEP_SECONDS, help="seconds to pause between steps")
+    parser.add_argument("--with-uploads", action="store_true", help="write a manifest of referenced uploads/ files")
+    parser.add_argument("--force", action="store_true", help="snapshot even if the database is unchanged")
+    parser.add_argument("--every", type=int, default=0, help="keep running and snapshot every N seconds")
+    args = parser.parse_args()
+
+    while True:
+        print_report(create_snapshot(args.db, args.archive, args.dest, args.keep, args.pages, args.sleep, args.with_uploads, args.force))
+        if not args.every:
+            break
+        time.sleep(args.every)
@@ -6,11 +6,32 @@ from jose import JWTError, jwt
 from datetime import datetime, timedelta
 import uuid
 from fastapi.responses import FileResponse
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
 import os
 import sqlite3
 import shutil
+import asyncio
+import time
+import zlib
+import hashlib
+import heapq
+import tempfile
+import threading
+from collections import OrderedDict
 from contextlib import contextmanager
 from passlib.context import CryptContext
+from backup_db import UPLOAD_REFERENCES, create_snapshot
+
+# Optional compressors; gzip is always available
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 # Password hashing (use pbkdf2_sha256 to avoid bcrypt native dependency issues)
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
@@ -20,18 +41,104 @@ os.makedirs("uploads/synopsis", exist_ok=True)
 os.makedirs("uploads/projects", exist_ok=True)
 os.makedirs("uploads/blackbook", exist_ok=True)
 
+DB_PATH = "tyforge.db"
+ARCHIVE_DB_PATH = "tyforge_archive.db"
+
+# Retention: aged rows are moved in small batches into the archive database
+# so the hot tables (and their indexes) stay small.
+RETENTION_BATCH_SIZE = 500
+RETENTION_BATCH_PAUSE_SECONDS = 0.05
+RETENTION_INTERVAL_SECONDS = 6 * 60 * 60
+INCREMENTAL_VACUUM_PAGES = 1000
+
+# Each policy selects the rows of a table that may be archived; "?" is the cutoff timestamp.
+RETENTION_POLICIES = {
+    "orders": {
+        "days": 180,
+        "where": "status IN ('Completed', 'Cancelled') AND created_at < ?",
+    },
+    "meetings": {
+        "days": 90,
+        "where": "scheduled_at < ?",
+    },
+    "admin_requests": {
+        "days": 90,
+        "where": "status IN ('resolved', 'completed', 'closed', 'rejected') AND updated_at < ?",
+    },
+    # Synopsis rows are only archived once a newer synopsis exists for the same user
+    "synopsis": {
+        "days": 30,
+        "where": """created_at < ? AND EXISTS (
+            SELECT 1 FROM main.synopsis newer
+            WHERE newer.user_id = synopsis.user_id AND newer.created_at > synopsis.created_at
+        )""",
+    },
+}
+
+# Upload reconciliation: files on disk are merge-joined against the DB columns
+# that reference them to find orphaned files and dangling references.
+UPLOAD_DIRS = ["uploads/synopsis", "uploads/projects"]
+QUARANTINE_DIR = "uploads/quarantine"
+QUARANTINE_RETENTION_DAYS = 7
+ORPHAN_GRACE_SECONDS = 60 * 60  # files are written before their row is committed
+RECONCILE_BATCH_SIZE = 500
+RECONCILE_SORT_CHUNK_SIZE = 10000  # file names held in memory while sorting a directory
+RECONCILE_INTERVAL_SECONDS = 24 * 60 * 60
+RECONCILE_REPORT_LIMIT = 100
+
+# Online snapshots of tyforge.db (see backup_db.py)
+BACKUP_INTERVAL_SECONDS = 6 * 60 * 60
+
+# Retention, upload reconciliation and backups must not interleave: rows moving
+# between main and archive mid-scan could make a referenced file look orphaned,
+# and every retention commit would restart a stepped backup from the first page
+maintenance_lock = threading.Lock()
+
 @contextmanager
-def get_db():
-    conn = sqlite3.connect("tyforge.db", check_same_thread=False, timeout=10)
+def get_db(archive: bool = False):
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, timeout=10)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
+    if archive:
+        conn.execute("ATTACH DATABASE ? AS archive", (ARCHIVE_DB_PATH,))
     try:
         yield conn
     finally:
         conn.close()
 
+def enable_incremental_vacuum(conn, schema: str = "main"):
+    # auto_vacuum can only be switched on an existing database by rebuilding it once
+    if conn.execute(f"PRAGMA {schema}.auto_vacuum").fetchone()[0] != 2:
+        conn.execute(f"PRAGMA {schema}.auto_vacuum = INCREMENTAL")
+        conn.execute(f"VACUUM {schema}")
+
+def table_columns(conn, schema: str, table: str):
+    return [row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+def sync_archive_columns(conn, table: str):
+    # Archive tables only copy the hot table's columns once; pick up any added since
+    archived = set(table_columns(conn, "archive", table))
+    for row in conn.execute(f"PRAGMA main.table_info({table})").fetchall():
+        if row[1] not in archived:
+            conn.execute(f"ALTER TABLE archive.{table} ADD COLUMN {row[1]} {row[2]}")
+
+def init_archive_db(conn):
+    enable_incremental_vacuum(conn, "archive")
+    for table in RETENTION_POLICIES:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS archive.{table} AS
+            SELECT *, '' AS archived_at FROM main.{table} WHERE 0
+        """)
+        sync_archive_columns(conn, table)
+        conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS archive.idx_{table}_id ON {table}(id)")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS archive.idx_{table}_user_id ON {table}(user_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS archive.idx_synopsis_file_name ON synopsis(file_name)")
+    conn.commit()
+
 def init_db():
     with get_db() as conn:
+        enable_incremental_vacuum(conn)
+
         # Users
         conn.execute("""
             CREATE TABLE IF NOT EXISTS users (
@@ -185,6 +292,9 @@ def init_db():
         conn.execute("CREATE INDEX IF NOT EXISTS idx_user_services_user_id ON user_services(user_id)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_user_projects_user_id ON user_projects(user_id)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_admin_requests_user_id ON admin_requests(user_id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_synopsis_file_name ON synopsis(file_name)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_projects_file_path ON projects(file_path)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_user_projects_synopsis_file_path ON user_projects(synopsis_file_path)")
         
         # Create plans
         plans_data = [
@@ -231,7 +341,7 @@ def init_db():
         
         # Add test data
         user = conn.execute("SELECT id FROM users WHERE email = ?", (test_email,)).fetchone()
-        if user:
+        if user and not conn.execute("SELECT 1 FROM projects WHERE user_id = ?", (user["id"],)).fetchone():
             # Test order
             conn.execute("""
                 INSERT OR IGNORE INTO orders (id, user_id, service_type, amount, status, created_at)
@@ -258,6 +368,185 @@ def init_db():
         
         conn.commit()
 
+    with get_db(archive=True) as conn:
+        init_archive_db(conn)
+
+def archive_batch(conn, table: str, where: str, cutoff: str, batch_size: int):
+    # One short write transaction per batch so live requests are not blocked for long
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        ids = [row["id"] for row in conn.execute(
+            f"SELECT id FROM main.{table} WHERE {where} LIMIT ?", (cutoff, batch_size)
+        )]
+        if ids:
+            placeholders = ",".join("?" * len(ids))
+            columns = ", ".join(table_columns(conn, "main", table))
+            conn.execute(f"""
+                INSERT OR REPLACE INTO archive.{table} ({columns}, archived_at)
+                SELECT {columns}, ? FROM main.{table} WHERE id IN ({placeholders})
+            """, (datetime.now().isoformat(), *ids))
+            conn.execute(f"DELETE FROM main.{table} WHERE id IN ({placeholders})", ids)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return len(ids)
+
+def run_retention(batch_size: int = RETENTION_BATCH_SIZE):
+    archived = {}
+    with maintenance_lock, get_db(archive=True) as conn:
+        for table, policy in RETENTION_POLICIES.items():
+            sync_archive_columns(conn, table)
+            conn.commit()
+            cutoff = (datetime.now() - timedelta(days=policy["days"])).isoformat()
+            archived[table] = 0
+            while True:
+                moved = archive_batch(conn, table, policy["where"], cutoff, batch_size)
+                archived[table] += moved
+                if moved < batch_size:
+                    break
+                time.sleep(RETENTION_BATCH_PAUSE_SECONDS)
+        # Hand the pages freed by the moves back to the filesystem, a chunk at a time
+        # (executescript steps the pragma to completion; execute() would free a single page)
+        free_before = conn.execute("PRAGMA main.freelist_count").fetchone()[0]
+        conn.executescript(f"PRAGMA main.incremental_vacuum({INCREMENTAL_VACUUM_PAGES});")
+        freed = free_before - conn.execute("PRAGMA main.freelist_count").fetchone()[0]
+    return {"archived": archived, "vacuumed_pages": freed}
+
+def iter_column_paths(conn, table: str, column: str, directory: str, batch_size: int):
+    # Keyset pages served in order straight from the column's index
+    upper = directory + "0"  # "0" sorts right after "/"
+    last = directory + "/"
+    while True:
+        rows = conn.execute(
+            f"SELECT {column} FROM {table} WHERE {column} > ? AND {column} < ? ORDER BY {column} LIMIT ?",
+            (last, upper, batch_size),
+        ).fetchall()
+        for row in rows:
+            yield row[0]
+        if len(rows) < batch_size:
+            return
+        last = rows[-1][0]
+
+def iter_referenced_paths(conn, directory: str, batch_size: int):
+    # Streams the distinct referenced paths under directory in sorted order
+    previous = None
+    for path in heapq.merge(*(
+        iter_column_paths(conn, table, column, directory, batch_size)
+        for table, column in UPLOAD_REFERENCES
+    )):
+        if path != previous:
+            yield path
+            previous = path
+
+def iter_sorted_file_names(directory: str, chunk_size: int):
+    # os.scandir has no ordering guarantee: sort bounded chunks into temp runs and merge them
+    runs, chunk = [], []
+
+    def spill():
+        run = tempfile.TemporaryFile(mode="w+")
+        run.writelines(f"{name}\n" for name in sorted(chunk))
+        run.seek(0)
+        runs.append(run)
+        chunk.clear()
+
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    chunk.append(entry.name)
+                    if len(chunk) >= chunk_size:
+                        spill()
+        if not runs:
+            yield from sorted(chunk)
+            return
+        if chunk:
+            spill()
+        yield from heapq.merge(*((line[:-1] for line in run) for run in runs))
+    finally:
+        for run in runs:
+            run.close()
+
+def reconcile_directory(conn, directory: str, batch_size: int, chunk_size: int):
+    # Merge-joins files on disk with referenced paths, yielding ("orphan" | "dangling", path)
+    refs = iter_referenced_paths(conn, directory, batch_size)
+    ref = next(refs, None)
+    for name in iter_sorted_file_names(directory, chunk_size):
+        path = f"{directory}/{name}"
+        while ref is not None and ref < path:
+            yield "dangling", ref
+            ref = next(refs, None)
+        if ref == path:
+            ref = next(refs, None)
+        else:
+            yield "orphan", path
+    while ref is not None:
+        yield "dangling", ref
+        ref = next(refs, None)
+
+def purge_quarantine(retention_days: int = QUARANTINE_RETENTION_DAYS):
+    reclaimed = 0
+    if not os.path.isdir(QUARANTINE_DIR):
+        return reclaimed
+    cutoff = datetime.now() - timedelta(days=retention_days)
+    with os.scandir(QUARANTINE_DIR) as entries:
+        for entry in entries:
+            try:
+                quarantined_at = datetime.strptime(entry.name, "%Y%m%d%H%M%S")
+            except ValueError:
+                continue
+            if entry.is_dir() and quarantined_at < cutoff:
+                for root, _, names in os.walk(entry.path):
+                    reclaimed += sum(os.path.getsize(os.path.join(root, n)) for n in names)
+                shutil.rmtree(entry.path)
+    return reclaimed
+
+def is_referenced(conn, path: str):
+    return any(
+        conn.execute(f"SELECT 1 FROM {table} WHERE {column} = ? LIMIT 1", (path,)).fetchone()
+        for table, column in UPLOAD_REFERENCES
+    )
+
+def reconcile_uploads(quarantine: bool = False, batch_size: int = RECONCILE_BATCH_SIZE):
+    now = time.time()
+    quarantine_dir = os.path.join(QUARANTINE_DIR, datetime.now().strftime("%Y%m%d%H%M%S"))
+    report = {"orphans": 0, "orphan_bytes": 0, "dangling": 0, "quarantined": 0,
+              "orphan_paths": [], "dangling_paths": []}
+    with maintenance_lock, get_db(archive=True) as conn:
+        for directory in UPLOAD_DIRS:
+            for kind, path in reconcile_directory(conn, directory, batch_size, RECONCILE_SORT_CHUNK_SIZE):
+                if kind == "dangling":
+                    report["dangling"] += 1
+                    if len(report["dangling_paths"]) < RECONCILE_REPORT_LIMIT:
+                        report["dangling_paths"].append(path)
+                    continue
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                # Skip files from uploads that may still be waiting on their DB row
+                if now - stat.st_mtime < ORPHAN_GRACE_SECONDS:
+                    continue
+                # The keyset pages are separate reads, so confirm against the current rows
+                if is_referenced(conn, path):
+                    continue
+                report["orphans"] += 1
+                report["orphan_bytes"] += stat.st_size
+                if len(report["orphan_paths"]) < RECONCILE_REPORT_LIMIT:
+                    report["orphan_paths"].append(path)
+                if quarantine:
+                    target = os.path.join(quarantine_dir, os.path.relpath(path, "uploads"))
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    shutil.move(path, target)
+                    report["quarantined"] += 1
+    if quarantine:
+        report["reclaimed_bytes"] = purge_quarantine()
+    return report
+
+def run_backup(with_uploads: bool = False, force: bool = False):
+    with maintenance_lock:
+        return create_snapshot(DB_PATH, ARCHIVE_DB_PATH, with_uploads=with_uploads, force=force)
+
 def get_user_by_email(email: str):
     with get_db() as conn:
         return conn.execute("SELECT * FROM users WHERE email = ?", (email,)).fetchone()
@@ -268,14 +557,17 @@ def verify_user_password(email: str, password: str):
         return user
     return None
 
-def get_user_orders(user_id: str):
-    with get_db() as conn:
-        return conn.execute("""
-            SELECT id, service_type, amount, status, created_at 
-            FROM orders 
-            WHERE user_id = ? 
-            ORDER BY created_at DESC
-        """, (user_id,)).fetchall()
+def query_with_archive(conn, table: str, columns: str, order_by: str, user_id: str, include_archived: bool):
+    query = f"SELECT {columns}, 0 AS archived FROM main.{table} WHERE user_id = ?"
+    params = [user_id]
+    if include_archived:
+        query += f" UNION ALL SELECT {columns}, 1 AS archived FROM archive.{table} WHERE user_id = ?"
+        params.append(user_id)
+    return conn.execute(f"{query} ORDER BY {order_by} DESC", params).fetchall()
+
+def get_user_orders(user_id: str, include_archived: bool = False):
+    with get_db(archive=include_archived) as conn:
+        return query_with_archive(conn, "orders", "id, service_type, amount, status, created_at", "created_at", user_id, include_archived)
 
 def get_user_projects(user_id: str):
     with get_db() as conn:
@@ -286,23 +578,13 @@ def get_user_projects(user_id: str):
             ORDER BY created_at DESC
         """, (user_id,)).fetchall()
 
-def get_user_synopsis(user_id: str):
-    with get_db() as conn:
-        return conn.execute("""
-            SELECT id, file_name, original_name, status, created_at 
-            FROM synopsis 
-            WHERE user_id = ? 
-            ORDER BY created_at DESC
-        """, (user_id,)).fetchall()
+def get_user_synopsis(user_id: str, include_archived: bool = False):
+    with get_db(archive=include_archived) as conn:
+        return query_with_archive(conn, "synopsis", "id, file_name, original_name, status, created_at", "created_at", user_id, include_archived)
 
-def get_user_meetings(user_id: str):
-    with get_db() as conn:
-        return conn.execute("""
-            SELECT id, scheduled_at, status, notes, created_at 
-            FROM meetings 
-            WHERE user_id = ? 
-            ORDER BY scheduled_at DESC
-        """, (user_id,)).fetchall()
+def get_user_meetings(user_id: str, include_archived: bool = False):
+    with get_db(archive=include_archived) as conn:
+        return query_with_archive(conn, "meetings", "id, scheduled_at, status, notes, created_at", "scheduled_at", user_id, include_archived)
 
 def create_user(email: str, password: str, name: str, phone: str = ""):
     with get_db() as conn:
@@ -427,6 +709,281 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Response compression
+COMPRESSION_MIN_SIZE = 1024
+# Levels for per-request compression vs. variants that are compressed once and cached
+COMPRESSION_LEVELS = {
+    "zstd": {"dynamic": 3, "precompressed": 19},
+    "br": {"dynamic": 4, "precompressed": 11},
+    "gzip": {"dynamic": 6, "precompressed": 9},
+}
+# Static-ish responses whose compressed variants are cached by ETag, whatever their size
+PRECOMPRESSED_PATHS = {"/api/plans", "/api/services", "/api/blackbook/download"}
+PRECOMPRESSED_CACHE_MAX_BYTES = 32 * 1024 * 1024
+# Larger bodies are not buffered for precompression; they get streamed dynamic compression instead
+PRECOMPRESS_MAX_SIZE = 1024 * 1024
+UNCOMPRESSIBLE_CONTENT_TYPES = (
+    "image/", "video/", "audio/", "font/woff",
+    "application/zip", "application/gzip", "application/x-gzip", "application/zstd",
+)
+
+compression_stats = {
+    encoding: {"responses": 0, "bytes_in": 0, "bytes_out": 0, "cpu_seconds": 0.0, "cache_hits": 0}
+    for encoding in COMPRESSION_LEVELS
+}
+compression_stats_lock = threading.Lock()
+precompressed_cache = OrderedDict()
+precompressed_cache_bytes = 0
+# Cached in place of a variant that came out no smaller than the original body
+IDENTITY_VARIANT = object()
+
+def available_encodings():
+    encodings = ["gzip"]
+    if brotli is not None:
+        encodings.insert(0, "br")
+    if zstandard is not None:
+        encodings.insert(0, "zstd")
+    return encodings
+
+def negotiate_encoding(accept_encoding: str):
+    # Picks the highest q-value encoding we support; ties go to the better compressor
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    best, best_q = None, 0.0
+    for encoding in available_encodings():
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+class StreamCompressor:
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "zstd":
+            self.compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        elif encoding == "br":
+            self.compressor = brotli.Compressor(quality=level)
+        else:
+            self.compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def _run(self, data: bytes, final: bool):
+        started = time.thread_time()
+        if self.encoding == "br":
+            out = self.compressor.process(data)
+            if final:
+                out += self.compressor.finish()
+        else:
+            out = self.compressor.compress(data)
+            if final:
+                out += self.compressor.flush()
+        stats = compression_stats[self.encoding]
+        with compression_stats_lock:
+            stats["bytes_in"] += len(data)
+            stats["bytes_out"] += len(out)
+            stats["cpu_seconds"] += time.thread_time() - started
+            if final:
+                stats["responses"] += 1
+        return out
+
+    def compress(self, data: bytes):
+        return self._run(data, final=False)
+
+    def finish(self, data: bytes = b""):
+        return self._run(data, final=True)
+
+def compress_body(encoding: str, body: bytes, precompressed: bool = False):
+    level = COMPRESSION_LEVELS[encoding]["precompressed" if precompressed else "dynamic"]
+    return StreamCompressor(encoding, level).finish(body)
+
+def variant_size(variant):
+    return 0 if variant is IDENTITY_VARIANT else len(variant)
+
+def get_precompressed(key):
+    variant = precompressed_cache.get(key)
+    if variant is not None:
+        precompressed_cache.move_to_end(key)
+        with compression_stats_lock:
+            compression_stats[key[2]]["cache_hits"] += 1
+    return variant
+
+def store_precompressed(key, variant):
+    global precompressed_cache_bytes
+    if key in precompressed_cache:
+        precompressed_cache_bytes -= variant_size(precompressed_cache.pop(key))
+    precompressed_cache[key] = variant
+    precompressed_cache_bytes += variant_size(variant)
+    while precompressed_cache_bytes > PRECOMPRESSED_CACHE_MAX_BYTES and precompressed_cache:
+        _, evicted = precompressed_cache.popitem(last=False)
+        precompressed_cache_bytes -= variant_size(evicted)
+
+class CompressionMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = CompressionResponder(self.app, encoding, scope["path"] in PRECOMPRESSED_PATHS)
+        await responder(scope, receive, send)
+
+class CompressionResponder:
+    def __init__(self, app, encoding: str, precompressed: bool):
+        self.app = app
+        self.encoding = encoding
+        self.precompressed = precompressed
+        self.send = None
+        self.path = None
+        self.start_message = None
+        self.mode = None  # "passthrough", "stream", "buffer" or "cached" once decided
+        self.compressor = None
+        self.chunks = []
+        self.buffered = 0
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        self.path = scope["path"]
+        await self.app(scope, receive, self.send_compressed)
+
+    def should_compress(self, headers, body: bytes, more_body: bool):
+        if self.start_message["status"] in (204, 304) or "content-encoding" in headers:
+            return False
+        if headers.get("content-type", "").startswith(UNCOMPRESSIBLE_CONTENT_TYPES):
+            return False
+        # Cached variants are compressed once, so the size floor doesn't apply to them
+        if self.precompressed:
+            return True
+        if "content-length" in headers:
+            return int(headers["content-length"]) >= COMPRESSION_MIN_SIZE
+        return more_body or len(body) >= COMPRESSION_MIN_SIZE
+
+    def set_encoding_headers(self, headers, body: bytes = None):
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if body is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(body))
+
+    def start_stream(self, headers):
+        self.mode = "stream"
+        level = COMPRESSION_LEVELS[self.encoding]["dynamic"]
+        self.compressor = StreamCompressor(self.encoding, level)
+        self.set_encoding_headers(headers)
+
+    async def send_stream_chunk(self, body: bytes, more_body: bool):
+        if more_body:
+            body = await run_in_threadpool(self.compressor.compress, body)
+        else:
+            body = await run_in_threadpool(self.compressor.finish, body)
+        if body or not more_body:
+            await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    async def send_variant(self, headers, etag: str, variant):
+        # Each encoded variant gets its own validator
+        weak = "W/" if etag.startswith("W/") else ""
+        base = etag.removeprefix("W/").strip('"')
+        headers["ETag"] = f'{weak}"{base}-{self.encoding}"'
+        self.set_encoding_headers(headers, variant)
+        await self.send(self.start_message)
+        await self.send({"type": "http.response.body", "body": variant})
+
+    async def start_response(self, message):
+        # Hold the headers back until we know how to encode, unless a cached variant already tells us
+        self.start_message = message
+        if not self.precompressed:
+            return
+        headers = MutableHeaders(raw=message["headers"])
+        if int(headers.get("content-length", 0)) > PRECOMPRESS_MAX_SIZE:
+            self.precompressed = False
+            return
+        etag = headers.get("etag")
+        if etag is None or message["status"] != 200 or "content-encoding" in headers:
+            return
+        variant = get_precompressed((self.path, etag, self.encoding))
+        if variant is IDENTITY_VARIANT:
+            self.mode = "passthrough"
+            await self.send(message)
+        elif variant is not None:
+            self.mode = "cached"
+            await self.send_variant(headers, etag, variant)
+
+    async def send_compressed(self, message):
+        if message["type"] == "http.response.start":
+            await self.start_response(message)
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        headers = MutableHeaders(raw=self.start_message["headers"])
+
+        if self.mode is None:
+            if not self.should_compress(headers, body, more_body):
+                self.mode = "passthrough"
+                await self.send(self.start_message)
+            elif self.precompressed:
+                self.mode = "buffer"
+            elif not more_body:
+                body = await run_in_threadpool(compress_body, self.encoding, body)
+                self.set_encoding_headers(headers, body)
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            else:
+                self.start_stream(headers)
+                await self.send(self.start_message)
+
+        if self.mode == "passthrough":
+            await self.send(message)
+        elif self.mode == "stream":
+            await self.send_stream_chunk(body, more_body)
+        elif self.mode == "buffer":
+            self.chunks.append(body)
+            self.buffered += len(body)
+            if not more_body:
+                await self.send_precompressed(headers, b"".join(self.chunks))
+            elif self.buffered > PRECOMPRESS_MAX_SIZE:
+                # Too big to hold for a cached variant after all; compress it as a stream
+                self.start_stream(headers)
+                await self.send(self.start_message)
+                body, self.chunks = b"".join(self.chunks), []
+                await self.send_stream_chunk(body, more_body)
+        # "cached": the variant was sent from the start message, drop the app's body
+
+    async def send_precompressed(self, headers, body: bytes):
+        etag = headers.get("etag") or f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        key = (self.path, etag, self.encoding)
+        variant = get_precompressed(key)
+        if variant is None:
+            variant = await run_in_threadpool(compress_body, self.encoding, body, True)
+            # Tiny or already-compressed bodies can grow once encoded; remember to send those as they are
+            if len(variant) >= len(body):
+                variant = IDENTITY_VARIANT
+            store_precompressed(key, variant)
+        if variant is IDENTITY_VARIANT:
+            await self.send(self.start_message)
+            await self.send({"type": "http.response.body", "body": body})
+            return
+        await self.send_variant(headers, etag, variant)
+
+app.add_middleware(CompressionMiddleware)
+
 # JWT Config
 SECRET_KEY = "local-secret-key-change-in-production"
 ALGORITHM = "HS256"
@@ -500,6 +1057,28 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
         raise HTTPException(status_code=401, detail="User not found")
     return dict(user)
 
+def get_current_admin(current_user: dict = Depends(get_current_user)):
+    if not current_user["is_admin"]:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
+
+# Background maintenance
+maintenance_tasks = []
+
+async def run_periodically(job, interval_seconds: int, *args):
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await run_in_threadpool(job, *args)
+        except Exception as e:
+            print(f"{job.__name__} failed: {e}")
+
+@app.on_event("startup")
+async def start_maintenance():
+    maintenance_tasks.append(asyncio.create_task(run_periodically(run_retention, RETENTION_INTERVAL_SECONDS)))
+    maintenance_tasks.append(asyncio.create_task(run_periodically(reconcile_uploads, RECONCILE_INTERVAL_SECONDS, True)))
+    maintenance_tasks.append(asyncio.create_task(run_periodically(run_backup, BACKUP_INTERVAL_SECONDS)))
+
 # Routes
 @app.post("/api/login", response_model=Token)
 async def login(user: UserLogin):
@@ -521,9 +1100,9 @@ async def get_me(current_user: dict = Depends(get_current_user)):
     }
 
 @app.get("/api/orders")
-async def get_orders(current_user: dict = Depends(get_current_user)):
-    orders = get_user_orders(current_user["id"])
-    return [{"id": o["id"], "service_type": o["service_type"], "amount": o["amount"], "status": o["status"], "created_at": o["created_at"]} for o in orders]
+async def get_orders(include_archived: bool = False, current_user: dict = Depends(get_current_user)):
+    orders = get_user_orders(current_user["id"], include_archived)
+    return [{"id": o["id"], "service_type": o["service_type"], "amount": o["amount"], "status": o["status"], "created_at": o["created_at"], "archived": bool(o["archived"])} for o in orders]
 
 @app.get("/api/projects")
 async def get_projects(current_user: dict = Depends(get_current_user)):
@@ -531,9 +1110,9 @@ async def get_projects(current_user: dict = Depends(get_current_user)):
     return [{"id": p["id"], "name": p["name"], "type": p["type"], "status": p["status"], "file_path": p["file_path"], "created_at": p["created_at"]} for p in projects]
 
 @app.get("/api/synopsis")
-async def get_synopsis(current_user: dict = Depends(get_current_user)):
-    synopsis = get_user_synopsis(current_user["id"])
-    return [{"id": s["id"], "file_name": s["file_name"], "original_name": s["original_name"], "status": s["status"], "created_at": s["created_at"]} for s in synopsis]
+async def get_synopsis(include_archived: bool = False, current_user: dict = Depends(get_current_user)):
+    synopsis = get_user_synopsis(current_user["id"], include_archived)
+    return [{"id": s["id"], "file_name": s["file_name"], "original_name": s["original_name"], "status": s["status"], "created_at": s["created_at"], "archived": bool(s["archived"])} for s in synopsis]
 
 @app.post("/api/synopsis/upload")
 async def upload_synopsis(
@@ -571,9 +1150,9 @@ async def book_meeting(current_user: dict = Depends(get_current_user)):
     return {"message": "Meeting booked successfully", "id": meeting_id}
 
 @app.get("/api/meetings")
-async def get_meetings(current_user: dict = Depends(get_current_user)):
-    meetings = get_user_meetings(current_user["id"])
-    return [{"id": m["id"], "scheduled_at": m["scheduled_at"], "status": m["status"], "notes": m["notes"], "created_at": m["created_at"]} for m in meetings]
+async def get_meetings(include_archived: bool = False, current_user: dict = Depends(get_current_user)):
+    meetings = get_user_meetings(current_user["id"], include_archived)
+    return [{"id": m["id"], "scheduled_at": m["scheduled_at"], "status": m["status"], "notes": m["notes"], "created_at": m["created_at"], "archived": bool(m["archived"])} for m in meetings]
 
 # New Signup Flow APIs
 @app.post("/api/signup")
@@ -682,6 +1261,37 @@ async def update_profile(profile_data: ProfileUpdate, current_user: dict = Depen
     update_user_profile(current_user["id"], profile_data.name, profile_data.phone)
     return {"message": "Profile updated successfully"}
 
+# Admin maintenance APIs
+@app.post("/api/admin/retention/run")
+async def run_retention_now(current_user: dict = Depends(get_current_admin)):
+    return await run_in_threadpool(run_retention)
+
+@app.post("/api/admin/uploads/reconcile")
+async def reconcile_uploads_now(quarantine: bool = False, current_user: dict = Depends(get_current_admin)):
+    return await run_in_threadpool(reconcile_uploads, quarantine)
+
+@app.post("/api/admin/backup")
+async def backup_now(with_uploads: bool = False, force: bool = False, current_user: dict = Depends(get_current_admin)):
+    try:
+        return await run_in_threadpool(run_backup, with_uploads, force)
+    except (RuntimeError, sqlite3.Error) as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/admin/metrics/compression")
+async def get_compression_metrics(current_user: dict = Depends(get_current_admin)):
+    with compression_stats_lock:
+        return {
+            "cache_entries": len(precompressed_cache),
+            "cache_bytes": precompressed_cache_bytes,
+            "encodings": {
+                encoding: {
+                    **stats,
+                    "ratio": round(stats["bytes_in"] / stats["bytes_out"], 3) if stats["bytes_out"] else None,
+                }
+                for encoding, stats in compression_stats.items()
+            },
+        }
+
 @app.get("/")
 async def root():
     return {"message": "running backend"}